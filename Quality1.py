@@ -3,15 +3,30 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import timedelta
 import calendar
+import io
+import os
+import hashlib
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Set page config
 st.set_page_config(layout="wide", page_title="Translation Quality Analysis", page_icon="📊")
 
-# Custom CSS for styling
-st.markdown("""
+# Custom CSS for styling. Streamlit drops elements that are not re-emitted on a
+# rerun, so the style block cannot be cached away; it is kept as one constant
+# and sent as a single element.
+CUSTOM_CSS = """
 <style>
+    .metric-row {
+        display: flex;
+    }
+    .metric-row .big-button {
+        flex: 1;
+    }
     .big-button {
         background-color: #f0f2f6;
         border-radius: 10px;
@@ -47,7 +62,8 @@ st.markdown("""
         box-shadow: 0 1px 3px rgba(0,0,0,0.1) !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Title
 st.title("Translation Quality Analysis Dashboard")
@@ -68,67 +84,299 @@ def generate_demo_data():
     categories = ["Major", "Minor", "Critical"]
     sub_categories = ["Linguistic", "Technical", "Stylistic"]
     
-    # Generate 100 random entries
+    # Generate 100 random entries, one vectorized draw per column
+    rng = np.random.default_rng(0)
+    n = 100
+    row_ids = np.arange(n).astype(str)
     data = {
-        "Month": np.random.choice(["January", "February", "March", "April", "May"], 100),
-        "LQE Date": [datetime(2023, np.random.randint(1, 6), np.random.randint(1, 28)) for _ in range(100)],
-        "Week": np.random.randint(1, 53, 100),
-        "Owner": np.random.choice(owners, 100),
-        "Task ID": [f"TASK-{np.random.randint(1000, 9999)}" for _ in range(100)],
-        "Project": [f"Project-{np.random.randint(1, 10)}" for _ in range(100)],
-        "Content Type": np.random.choice(content_types, 100),
-        "Product": np.random.choice(products, 100),
-        "Service Type": np.random.choice(service_types, 100),
-        "Source Text": [f"Source text sample {i}" for i in range(100)],
-        "Translated Text": [f"Translated text sample {i}" for i in range(100)],
-        "Corrected Text Show Edits": [f"Corrected <span style='color:red;text-decoration:line-through;'>text</span> <span style='color:green;'>translation</span> sample {i}" for i in range(100)],
-        "Error Type & comment": [f"Error type {np.random.choice(['A', 'B', 'C'])} - Comment {i}" for i in range(100)],
-        "Issue Type": np.random.choice(issue_types, 100),
-        "Internal/External factor validated by LL": np.random.choice(factors, 100),
-        "Category": np.random.choice(categories, 100),
-        "Sub - cateogory": np.random.choice(sub_categories, 100),
-        "Clarification": [f"Clarification {i % 5}" for i in range(100)],
-        "Sub-clarification": [f"Sub-clarification {i % 3}" for i in range(100)],
-        "Repeat": np.random.choice(["Yes", "No"], 100),
-        "Reason": [f"Reason {i % 7}" for i in range(100)],
-        "Final action": np.random.choice(["Fixed", "Rejected", "Pending"], 100),
-        "Final status": np.random.choice(["Closed", "Open"], 100),
-        "Remark": [f"Remark {i}" for i in range(100)],
-        "Global categories": np.random.choice(["Cat A", "Cat B", "Cat C"], 100)
+        "Month": rng.choice(["January", "February", "March", "April", "May"], n),
+        "LQE Date": pd.to_datetime(pd.DataFrame({"year": 2023,
+                                                 "month": rng.integers(1, 6, n),
+                                                 "day": rng.integers(1, 28, n)})),
+        "Week": rng.integers(1, 53, n),
+        "Owner": rng.choice(owners, n),
+        "Task ID": np.char.add("TASK-", rng.integers(1000, 9999, n).astype(str)),
+        "Project": np.char.add("Project-", rng.integers(1, 10, n).astype(str)),
+        "Content Type": rng.choice(content_types, n),
+        "Product": rng.choice(products, n),
+        "Service Type": rng.choice(service_types, n),
+        "Source Text": np.char.add("Source text sample ", row_ids),
+        "Translated Text": np.char.add("Translated text sample ", row_ids),
+        "Corrected Text Show Edits": np.char.add("Corrected <span style='color:red;text-decoration:line-through;'>text</span> <span style='color:green;'>translation</span> sample ", row_ids),
+        "Error Type & comment": np.char.add(np.char.add(np.char.add("Error type ", rng.choice(["A", "B", "C"], n)), " - Comment "), row_ids),
+        "Issue Type": rng.choice(issue_types, n),
+        "Internal/External factor validated by LL": rng.choice(factors, n),
+        "Category": rng.choice(categories, n),
+        "Sub - cateogory": rng.choice(sub_categories, n),
+        "Clarification": np.char.add("Clarification ", (np.arange(n) % 5).astype(str)),
+        "Sub-clarification": np.char.add("Sub-clarification ", (np.arange(n) % 3).astype(str)),
+        "Repeat": rng.choice(["Yes", "No"], n),
+        "Reason": np.char.add("Reason ", (np.arange(n) % 7).astype(str)),
+        "Final action": rng.choice(["Fixed", "Rejected", "Pending"], n),
+        "Final status": rng.choice(["Closed", "Open"], n),
+        "Remark": np.char.add("Remark ", row_ids),
+        "Global categories": rng.choice(["Cat A", "Cat B", "Cat C"], n)
     }
     
     return pd.DataFrame(data)
 
+# Parse dates and derive the calendar columns once per dataset
+def prepare_dates(df):
+    if 'LQE Date' in df.columns:
+        try:
+            df['LQE Date'] = pd.to_datetime(df['LQE Date'])
+            df['Month'] = df['LQE Date'].dt.strftime('%B')
+            df['Year'] = df['LQE Date'].dt.year
+            # Vectorized day and month keys reused by the filters and trend groupbys
+            df['LQE_Date_only'] = df['LQE Date'].dt.normalize()
+            df['LQE_Period_M'] = df['LQE Date'].dt.to_period('M')
+        except Exception as e:
+            st.warning(f"Error converting dates: {str(e)}")
+    return df
+
+# Low-cardinality columns used for grouping, counting and colouring
+CAT_COLS = [
+    'Owner', 'Content Type', 'Product', 'Service Type', 'Issue Type',
+    'Category', 'Sub - cateogory', 'Internal/External factor validated by LL',
+    'Final status', 'Global categories',
+]
+
+# Store repeated labels as integer codes so groupbys and masks stay cheap
+def convert_categories(df):
+    for c in CAT_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
+
+# Free-text columns scanned by the error detail search box
+SEARCH_COLS = ['Source Text', 'Translated Text', 'Error Type & comment', 'Task ID']
+
+# Arrow-backed strings give the search a native substring scan
+def convert_search_columns(df):
+    for c in SEARCH_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("string[pyarrow]")
+    return df
+
+# Free-text cells often mix numbers and text (Remark, Project, ...); store any
+# remaining object column as nullable strings so Parquet can represent it
+def convert_object_columns(df):
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].astype("string")
+    return df
+
+def prepare_df(df):
+    # Fix for mixed data types in Owner column: blanks become "Unknown"
+    # and numbers become strings, so the owner filter can match every row
+    if 'Owner' in df.columns:
+        df['Owner'] = df['Owner'].fillna('Unknown').astype(str)
+    df = convert_object_columns(prepare_dates(df))
+    return convert_search_columns(convert_categories(df))
+
+# Columnar sidecar cache for parsed workbooks. Bump SIDECAR_VERSION whenever
+# prepare_df changes so sidecars written by older code are not reused.
+CACHE_DIR = ".cache"
+SIDECAR_VERSION = 3
+
+# Sidecars kept on disk; the least recently used ones beyond this are removed
+SIDECAR_MAX_FILES = 20
+
+# Columns a sidecar must provide; otherwise the workbook is parsed again
+SIDECAR_REQUIRED_COLS = ['LQE Date', 'LQE_Date_only', 'LQE_Period_M', 'Owner']
+
+# Columns the dashboard actually reads; everything else is skipped on reload
+USED_COLS = [
+    'LQE Date', 'LQE_Date_only', 'LQE_Period_M', 'Month', 'Year', 'Owner',
+    'Task ID', 'Project', 'Content Type', 'Product', 'Service Type',
+    'Source Text', 'Translated Text', 'Corrected Text Show Edits',
+    'Error Type & comment', 'Issue Type',
+    'Internal/External factor validated by LL', 'Category', 'Sub - cateogory',
+    'Clarification', 'Sub-clarification', 'Final status', 'Remark',
+]
+
+def is_used_col(col):
+    # Keep look-alike "corrected ... edits" columns for the error detail fallback
+    return col in USED_COLS or ('correct' in col.lower() and 'edit' in col.lower())
+
+def prune_sidecars():
+    # Drop sidecars from older versions, then keep the most recently used ones
+    try:
+        current, stale = [], []
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith(f".v{SIDECAR_VERSION}.parquet"):
+                current.append(os.path.join(CACHE_DIR, name))
+            elif name.endswith(".parquet"):
+                stale.append(os.path.join(CACHE_DIR, name))
+        current.sort(key=os.path.getmtime, reverse=True)
+        for path in stale + current[SIDECAR_MAX_FILES:]:
+            os.remove(path)
+    except OSError as e:
+        logger.warning("Could not prune Parquet sidecars: %s", e)
+
+# Excel parsing is the heaviest step, so cache it keyed by the upload's md5.
+# The bytes are an underscore argument so Streamlit does not hash them again.
+@st.cache_data(show_spinner=False)
+def load_df(file_key: str, _file_bytes: bytes) -> pd.DataFrame:
+    path = os.path.join(CACHE_DIR, f"{file_key}.v{SIDECAR_VERSION}.parquet")
+
+    # Reuse the Parquet sidecar from an earlier session if there is one
+    if os.path.exists(path):
+        try:
+            import pyarrow.parquet as pq
+            columns = [c for c in pq.read_schema(path).names if is_used_col(c)]
+            if all(c in columns for c in SIDECAR_REQUIRED_COLS):
+                df = pd.read_parquet(path, columns=columns)
+                os.utime(path)  # mark as recently used for pruning
+                return df
+        except Exception:
+            pass
+
+    df = pd.read_excel(io.BytesIO(_file_bytes))
+    df.columns = df.columns.astype(str)
+    df = prepare_df(df)
+
+    # Writing the sidecar is best-effort. Write to a per-process temp file and
+    # rename, so concurrent sessions uploading the same workbook never read a
+    # half-written parquet.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        prune_sidecars()
+    except Exception as e:
+        logger.warning("Skipping Parquet sidecar for %s: %s", file_key, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+@st.cache_data
+def load_demo_df():
+    return prepare_df(generate_demo_data())
+
+# Cached figure builders. Every builder is keyed by filter_key =
+# (data_key, owner, start_date, end_date); the filtered frame itself is passed
+# as an underscore argument so Streamlit skips hashing it. Widgets that do not
+# change the filters (pagination, search) therefore reuse the cached figures.
+# Figures are shared via cache_resource rather than copied out of cache_data:
+# they are never mutated after building, and unpickling a Figure re-validates
+# every trace, which costs several times more than serializing it for the page.
+# cache_resource is server-wide and never evicted by default, so every builder
+# is bounded to FIGURE_CACHE_SELECTIONS filter selections and expires after
+# FIGURE_CACHE_TTL seconds.
+FIGURE_CACHE_SELECTIONS = 32
+FIGURE_CACHE_TTL = 3600
+
+def is_daily_view(filter_key):
+    # Daily points within a single month, monthly points otherwise
+    _, _, start_date, end_date = filter_key
+    return (start_date is not None and start_date.year == end_date.year
+            and start_date.month == end_date.month)
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_SELECTIONS, ttl=FIGURE_CACHE_TTL)
+def compute_trend_counts(_filtered_df, filter_key):
+    # One groupby shared by the overall, category and sub-category trends.
+    # dropna=False keeps rows without a category in the overall trend, but it
+    # also keeps a NaT time group, which is dropped again after grouping. The
+    # small per-chart re-groupings below sort by date for the line order.
+    time_key = 'LQE_Date_only' if is_daily_view(filter_key) else 'LQE_Period_M'
+    counts = _filtered_df.groupby([time_key, 'Category', 'Sub - cateogory'], observed=True, dropna=False, sort=False)['Task ID'].count().reset_index(name='n')
+    counts = counts.rename(columns={time_key: 'LQE Date'})
+    if time_key == 'LQE_Period_M':
+        counts['LQE Date'] = counts['LQE Date'].dt.to_timestamp()
+    return counts[counts['LQE Date'].notna()]
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_SELECTIONS, ttl=FIGURE_CACHE_TTL)
+def build_trend_fig(_filtered_df, filter_key):
+    counts = compute_trend_counts(_filtered_df, filter_key)
+    time_trend = counts.groupby('LQE Date')['n'].sum().rename('Task ID').reset_index()
+    x_label = 'Date' if is_daily_view(filter_key) else 'Month'
+    fig = px.line(time_trend, x='LQE Date', y='Task ID',
+                  labels={'Task ID': 'Number of Errors', 'LQE Date': x_label},
+                  markers=True)
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_SELECTIONS * 2, ttl=FIGURE_CACHE_TTL)
+def build_group_trend_fig(_filtered_df, filter_key, column):
+    counts = compute_trend_counts(_filtered_df, filter_key)
+    group_time = counts.groupby(['LQE Date', column], observed=True)['n'].sum().rename('Task ID').reset_index()
+    x_label = 'Date' if is_daily_view(filter_key) else 'Month'
+    fig = px.line(group_time, x='LQE Date', y='Task ID', color=column,
+                  labels={'Task ID': 'Number of Errors', 'LQE Date': x_label},
+                  markers=True)
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_SELECTIONS * 4, ttl=FIGURE_CACHE_TTL)
+def build_pie_fig(_filtered_df, filter_key, column, title, colors):
+    # Count slices up front rather than sending one label per row to the browser
+    counts = _filtered_df[column].value_counts(sort=False)
+    counts = counts[counts > 0].rename_axis(column).reset_index(name='Count')
+    fig = px.pie(counts, names=column, values='Count', title=title,
+                 color_discrete_sequence=colors)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_SELECTIONS, ttl=FIGURE_CACHE_TTL)
+def build_heatmap_fig(_filtered_df, filter_key):
+    # Contingency table of category x sub-category counts in one call
+    pivot_table = pd.crosstab(_filtered_df['Category'], _filtered_df['Sub - cateogory'])
+
+    fig = px.imshow(pivot_table,
+                    labels=dict(x="Sub-category", y="Category", color="Count"),
+                    text_auto=True, aspect="auto",
+                    color_continuous_scale='Viridis')
+    fig.update_layout(height=400)
+    return fig
+
+# Largest number of bars drawn per bar chart
+MAX_BARS = 30
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_SELECTIONS * 5, ttl=FIGURE_CACHE_TTL)
+def build_bar_fig(_filtered_df, filter_key, column, label, title):
+    counts = _filtered_df[column].value_counts()
+    counts = counts[counts > 0]  # drop unobserved categories
+    # Bound the number of bars for high-cardinality columns
+    if len(counts) > MAX_BARS:
+        counts = counts.head(MAX_BARS)
+        title = f"{title} (top {MAX_BARS})"
+
+    # One go.Bar trace with per-bar colours instead of a px trace per category
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure(go.Bar(x=counts.index.to_numpy(), y=counts.to_numpy(), text=counts.to_numpy(),
+                           marker_color=[palette[i % len(palette)] for i in range(len(counts))]))
+    fig.update_layout(title=title, xaxis_title=label, yaxis_title='Count',
+                      xaxis_type='category', height=400)
+    return fig
+
 # Load data
 if uploaded_file:
     try:
-        df = pd.read_excel(uploaded_file)
+        # Hash each upload once; reruns reuse the digest stored for its file_id
+        if st.session_state.get('upload_file_id') != uploaded_file.file_id:
+            st.session_state['upload_md5'] = hashlib.md5(uploaded_file.getvalue()).hexdigest()
+            st.session_state['upload_file_id'] = uploaded_file.file_id
+        data_key = st.session_state['upload_md5']
+        df = load_df(data_key, uploaded_file.getvalue())
     except Exception as e:
         st.error(f"Error loading file: {str(e)}")
-        df = generate_demo_data()
+        df = load_demo_df()
+        data_key = "demo"
         st.sidebar.info("Using demo data due to error. Please check your Excel file.")
 else:
-    df = generate_demo_data()
+    df = load_demo_df()
+    data_key = "demo"
     st.sidebar.info("Using demo data. Upload your Excel file for actual analysis.")
 
-# Convert date column to datetime if needed
-if 'LQE Date' in df.columns:
-    try:
-        df['LQE Date'] = pd.to_datetime(df['LQE Date'])
-        df['Month'] = df['LQE Date'].dt.strftime('%B')
-        df['Year'] = df['LQE Date'].dt.year
-    except Exception as e:
-        st.warning(f"Error converting dates: {str(e)}")
-
 # Sidebar filters
 st.sidebar.header("Filters")
 
 # Owner selection with "All" option
-# Fix for mixed data types in Owner column
-owners_list = df['Owner'].unique()
-# Convert any NaN values to strings
-owners_list = [str(owner) if not pd.isna(owner) else "Unknown" for owner in owners_list]
-all_owners = sorted(owners_list)
+# Owner is normalised to string categories in the loader, so the
+# distinct values are just the categorical's dictionary
+all_owners = sorted(df['Owner'].cat.categories.tolist())
 selected_owner = st.sidebar.selectbox("Select Owner", ["All Owners"] + all_owners)
 
 # Date range filter
@@ -136,15 +384,21 @@ date_min = df['LQE Date'].min().date()
 date_max = df['LQE Date'].max().date()
 date_range = st.sidebar.date_input("Select Date Range", [date_min, date_max])
 
-# Apply filters
-filtered_df = df.copy()
+# Apply filters - compose a single boolean mask and index once
+mask = np.ones(len(df), dtype=bool)
 if selected_owner != "All Owners":
-    filtered_df = filtered_df[filtered_df['Owner'] == selected_owner]
+    mask &= (df['Owner'] == selected_owner).to_numpy()
 
+start_date, end_date = None, None
 if len(date_range) == 2:
     start_date, end_date = date_range
-    filtered_df = filtered_df[(filtered_df['LQE Date'].dt.date >= start_date) & 
-                              (filtered_df['LQE Date'].dt.date <= end_date)]
+    date_values = df['LQE_Date_only'].to_numpy()
+    mask &= (date_values >= np.datetime64(start_date)) & (date_values <= np.datetime64(end_date))
+
+filtered_df = df[mask]
+
+# Identifies the filtered frame for the cached figure builders
+filter_key = (data_key, selected_owner, start_date, end_date)
 
 # Main dashboard area
 if selected_owner == "All Owners":
@@ -152,66 +406,25 @@ if selected_owner == "All Owners":
 else:
     st.markdown(f"## Analysis for: {selected_owner}")
 
-# Metrics in big buttons
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("""
-    <div class="big-button">
-        <p>Total Errors</p>
-        <h1>{}</h1>
-    </div>
-    """.format(len(filtered_df)), unsafe_allow_html=True)
-
-with col2:
-    internal_count = filtered_df[filtered_df['Internal/External factor validated by LL'] == 'Internal'].shape[0]
-    st.markdown("""
-    <div class="big-button">
-        <p>Internal Factors</p>
-        <h1>{}</h1>
-    </div>
-    """.format(internal_count), unsafe_allow_html=True)
-
-with col3:
-    external_count = filtered_df[filtered_df['Internal/External factor validated by LL'] == 'External'].shape[0]
-    st.markdown("""
-    <div class="big-button">
-        <p>External Factors</p>
-        <h1>{}</h1>
-    </div>
-    """.format(external_count), unsafe_allow_html=True)
-
-# Trend over time - Determine if we should show daily or monthly trend
+# Metrics in big buttons - count every factor value in a single pass
+factor_counts = filtered_df['Internal/External factor validated by LL'].value_counts(dropna=False, sort=False)
+total_count = len(filtered_df)
+internal_count = int(factor_counts.get('Internal', 0))
+external_count = int(factor_counts.get('External', 0))
+
+# All three tiles go out as one element instead of one per column
+metric_tiles = "".join(
+    f'<div class="big-button"><p>{label}</p><h1>{value}</h1></div>'
+    for label, value in [("Total Errors", total_count),
+                         ("Internal Factors", internal_count),
+                         ("External Factors", external_count)]
+)
+st.markdown(f'<div class="metric-row">{metric_tiles}</div>', unsafe_allow_html=True)
+
+# Trend over time - daily within a single month, monthly otherwise
 st.markdown("## Error Trend Over Time")
 
-if len(date_range) == 2:
-    start_date, end_date = date_range
-    # Check if the range is within a single month
-    same_month = (start_date.year == end_date.year) and (start_date.month == end_date.month)
-    
-    if same_month:
-        # Use daily trend for a single month
-        time_trend = filtered_df.groupby(filtered_df['LQE Date'].dt.date)['Task ID'].count().reset_index()
-        fig_trend = px.line(time_trend, x='LQE Date', y='Task ID', 
-                           labels={'Task ID': 'Number of Errors', 'LQE Date': 'Date'},
-                           markers=True)
-    else:
-        # Use monthly trend for multi-month period
-        time_trend = filtered_df.groupby([filtered_df['LQE Date'].dt.to_period('M')])['Task ID'].count().reset_index()
-        time_trend['LQE Date'] = time_trend['LQE Date'].dt.to_timestamp()
-        fig_trend = px.line(time_trend, x='LQE Date', y='Task ID', 
-                           labels={'Task ID': 'Number of Errors', 'LQE Date': 'Month'},
-                           markers=True)
-else:
-    # Default to monthly view
-    time_trend = filtered_df.groupby([filtered_df['LQE Date'].dt.to_period('M')])['Task ID'].count().reset_index()
-    time_trend['LQE Date'] = time_trend['LQE Date'].dt.to_timestamp()
-    fig_trend = px.line(time_trend, x='LQE Date', y='Task ID', 
-                       labels={'Task ID': 'Number of Errors', 'LQE Date': 'Month'},
-                       markers=True)
-
-fig_trend.update_layout(height=400)
-st.plotly_chart(fig_trend, use_container_width=True)
+st.plotly_chart(build_trend_fig(filtered_df, filter_key), use_container_width=True)
 
 # Category and Sub-category trends over time
 st.markdown("## Category and Sub-Category Trends")
@@ -219,42 +432,10 @@ st.markdown("## Category and Sub-Category Trends")
 cat_tabs = st.tabs(["Category Trends", "Sub-Category Trends"])
 
 with cat_tabs[0]:
-    # Category trend over time
-    if len(date_range) == 2 and (start_date.year == end_date.year) and (start_date.month == end_date.month):
-        # Daily trend for categories
-        cat_time = filtered_df.groupby([filtered_df['LQE Date'].dt.date, 'Category'])['Task ID'].count().reset_index()
-        fig_cat_trend = px.line(cat_time, x='LQE Date', y='Task ID', color='Category',
-                               labels={'Task ID': 'Number of Errors', 'LQE Date': 'Date'},
-                               markers=True)
-    else:
-        # Monthly trend for categories
-        cat_time = filtered_df.groupby([filtered_df['LQE Date'].dt.to_period('M'), 'Category'])['Task ID'].count().reset_index()
-        cat_time['LQE Date'] = cat_time['LQE Date'].dt.to_timestamp()
-        fig_cat_trend = px.line(cat_time, x='LQE Date', y='Task ID', color='Category',
-                               labels={'Task ID': 'Number of Errors', 'LQE Date': 'Month'},
-                               markers=True)
-    
-    fig_cat_trend.update_layout(height=400)
-    st.plotly_chart(fig_cat_trend, use_container_width=True)
+    st.plotly_chart(build_group_trend_fig(filtered_df, filter_key, 'Category'), use_container_width=True)
 
 with cat_tabs[1]:
-    # Sub-category trend over time
-    if len(date_range) == 2 and (start_date.year == end_date.year) and (start_date.month == end_date.month):
-        # Daily trend for sub-categories
-        subcat_time = filtered_df.groupby([filtered_df['LQE Date'].dt.date, 'Sub - cateogory'])['Task ID'].count().reset_index()
-        fig_subcat_trend = px.line(subcat_time, x='LQE Date', y='Task ID', color='Sub - cateogory',
-                                  labels={'Task ID': 'Number of Errors', 'LQE Date': 'Date'},
-                                  markers=True)
-    else:
-        # Monthly trend for sub-categories
-        subcat_time = filtered_df.groupby([filtered_df['LQE Date'].dt.to_period('M'), 'Sub - cateogory'])['Task ID'].count().reset_index()
-        subcat_time['LQE Date'] = subcat_time['LQE Date'].dt.to_timestamp()
-        fig_subcat_trend = px.line(subcat_time, x='LQE Date', y='Task ID', color='Sub - cateogory',
-                                  labels={'Task ID': 'Number of Errors', 'LQE Date': 'Month'},
-                                  markers=True)
-    
-    fig_subcat_trend.update_layout(height=400)
-    st.plotly_chart(fig_subcat_trend, use_container_width=True)
+    st.plotly_chart(build_group_trend_fig(filtered_df, filter_key, 'Sub - cateogory'), use_container_width=True)
 
 # Top-level breakdowns
 st.markdown("## Error Distribution")
@@ -263,43 +444,31 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Content Type breakdown
-    fig_content = px.pie(filtered_df, names='Content Type', title='Errors by Content Type',
-                         color_discrete_sequence=px.colors.qualitative.Pastel)
-    fig_content.update_traces(textposition='inside', textinfo='percent+label')
+    fig_content = build_pie_fig(filtered_df, filter_key, 'Content Type', 'Errors by Content Type',
+                                px.colors.qualitative.Pastel)
     st.plotly_chart(fig_content, use_container_width=True)
     
     # Service Type breakdown
-    fig_service = px.pie(filtered_df, names='Service Type', title='Errors by Service Type',
-                        color_discrete_sequence=px.colors.qualitative.Pastel1)
-    fig_service.update_traces(textposition='inside', textinfo='percent+label')
+    fig_service = build_pie_fig(filtered_df, filter_key, 'Service Type', 'Errors by Service Type',
+                                px.colors.qualitative.Pastel1)
     st.plotly_chart(fig_service, use_container_width=True)
 
 with col2:
     # Product breakdown
-    fig_product = px.pie(filtered_df, names='Product', title='Errors by Product',
-                         color_discrete_sequence=px.colors.qualitative.Pastel2)
-    fig_product.update_traces(textposition='inside', textinfo='percent+label')
+    fig_product = build_pie_fig(filtered_df, filter_key, 'Product', 'Errors by Product',
+                                px.colors.qualitative.Pastel2)
     st.plotly_chart(fig_product, use_container_width=True)
     
     # Issue Type breakdown
-    fig_issue = px.pie(filtered_df, names='Issue Type', title='Errors by Issue Type',
-                      color_discrete_sequence=px.colors.qualitative.Set3)
-    fig_issue.update_traces(textposition='inside', textinfo='percent+label')
+    fig_issue = build_pie_fig(filtered_df, filter_key, 'Issue Type', 'Errors by Issue Type',
+                              px.colors.qualitative.Set3)
     st.plotly_chart(fig_issue, use_container_width=True)
 
 # Categorical analysis
 st.markdown("## Detailed Categorical Analysis")
 
 # Heatmap by category and sub-category
-cat_subcat = filtered_df.groupby(['Category', 'Sub - cateogory']).size().reset_index(name='count')
-pivot_table = cat_subcat.pivot(index='Category', columns='Sub - cateogory', values='count').fillna(0)
-
-fig_heatmap = px.imshow(pivot_table, 
-                       labels=dict(x="Sub-category", y="Category", color="Count"),
-                       text_auto=True, aspect="auto",
-                       color_continuous_scale='Viridis')
-fig_heatmap.update_layout(height=400)
-st.plotly_chart(fig_heatmap, use_container_width=True)
+st.plotly_chart(build_heatmap_fig(filtered_df, filter_key), use_container_width=True)
 
 # Advanced breakdowns in tabs
 st.markdown("## Error Analysis by Categories")
@@ -308,151 +477,151 @@ tab1, tab2, tab3 = st.tabs(["Factor Analysis", "Category Breakdown", "Clarificat
 
 with tab1:
     # Internal/External factor analysis
-    factor_df = filtered_df['Internal/External factor validated by LL'].value_counts().reset_index()
-    factor_df.columns = ['Factor', 'Count']
-    
-    fig_factor = px.bar(factor_df, x='Factor', y='Count', 
-                       title='Internal vs External Factors',
-                       color='Factor', 
-                       text='Count')
-    fig_factor.update_layout(height=400)
+    fig_factor = build_bar_fig(filtered_df, filter_key, 'Internal/External factor validated by LL',
+                               'Factor', 'Internal vs External Factors')
     st.plotly_chart(fig_factor, use_container_width=True)
 
 with tab2:
     # Category analysis
-    cat_df = filtered_df['Category'].value_counts().reset_index()
-    cat_df.columns = ['Category', 'Count']
-    
-    fig_cat = px.bar(cat_df, x='Category', y='Count',
-                    title='Error Categories',
-                    color='Category',
-                    text='Count')
-    fig_cat.update_layout(height=400)
+    fig_cat = build_bar_fig(filtered_df, filter_key, 'Category', 'Category', 'Error Categories')
     st.plotly_chart(fig_cat, use_container_width=True)
     
     # Sub-category analysis
-    subcat_df = filtered_df['Sub - cateogory'].value_counts().reset_index()
-    subcat_df.columns = ['Sub-category', 'Count']
-    
-    fig_subcat = px.bar(subcat_df, x='Sub-category', y='Count',
-                       title='Error Sub-categories',
-                       color='Sub-category',
-                       text='Count')
-    fig_subcat.update_layout(height=400)
+    fig_subcat = build_bar_fig(filtered_df, filter_key, 'Sub - cateogory', 'Sub-category', 'Error Sub-categories')
     st.plotly_chart(fig_subcat, use_container_width=True)
 
 with tab3:
     # Clarification analysis
-    clarif_df = filtered_df['Clarification'].value_counts().reset_index()
-    clarif_df.columns = ['Clarification', 'Count']
-    
-    fig_clarif = px.bar(clarif_df, x='Clarification', y='Count',
-                       title='Error Clarifications',
-                       color='Clarification',
-                       text='Count')
-    fig_clarif.update_layout(height=400)
+    fig_clarif = build_bar_fig(filtered_df, filter_key, 'Clarification', 'Clarification', 'Error Clarifications')
     st.plotly_chart(fig_clarif, use_container_width=True)
     
     # Sub-clarification analysis
-    subclarif_df = filtered_df['Sub-clarification'].value_counts().reset_index()
-    subclarif_df.columns = ['Sub-clarification', 'Count']
-    
-    fig_subclarif = px.bar(subclarif_df, x='Sub-clarification', y='Count',
-                          title='Error Sub-clarifications',
-                          color='Sub-clarification',
-                          text='Count')
-    fig_subclarif.update_layout(height=400)
+    fig_subclarif = build_bar_fig(filtered_df, filter_key, 'Sub-clarification', 'Sub-clarification',
+                                  'Error Sub-clarifications')
     st.plotly_chart(fig_subclarif, use_container_width=True)
 
-# Individual error details with expandable view
+# Individual error details
+DETAIL_COLS = [
+    'LQE Date', 'Task ID', 'Owner', 'Project', 'Content Type', 'Product',
+    'Service Type', 'Issue Type', 'Internal/External factor validated by LL',
+    'Category', 'Sub - cateogory', 'Final status', 'Source Text',
+    'Translated Text', 'Corrected Text Show Edits', 'Error Type & comment', 'Remark',
+]
+
 st.markdown("## Individual Error Details")
 
-# Add search filter for error details
-search_term = st.text_input("Search in error details:", "")
-if search_term:
-    search_results = filtered_df[
-        filtered_df['Source Text'].str.contains(search_term, case=False) |
-        filtered_df['Translated Text'].str.contains(search_term, case=False) |
-        filtered_df['Error Type & comment'].str.contains(search_term, case=False) |
-        filtered_df['Task ID'].str.contains(search_term, case=False)
-    ]
-    display_df = search_results
-else:
-    display_df = filtered_df
+# Search, pagination and row selection only rerun this fragment, so they
+# never rebuild the charts above
+@st.fragment
+def error_details_panel(filtered_df):
+    # Add search filter for error details
+    search_term = st.text_input("Search in error details:", "")
+    if search_term:
+        # Plain (non-regex) case-insensitive substring match, OR-ed across columns
+        search_mask = np.zeros(len(filtered_df), dtype=bool)
+        for c in SEARCH_COLS:
+            if c in filtered_df.columns:
+                search_mask |= filtered_df[c].str.contains(search_term, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        display_df = filtered_df[search_mask]
+    else:
+        display_df = filtered_df
 
-# Sort by date, most recent first
-display_df = display_df.sort_values('LQE Date', ascending=False)
+    # Sort by date, most recent first
+    display_df = display_df.sort_values('LQE Date', ascending=False)
 
-# Pagination for errors
-items_per_page = 10
-total_pages = (len(display_df) + items_per_page - 1) // items_per_page
+    # Pagination for errors - a page is rendered as one table instead of per-row widgets
+    items_per_page = 100
+    total_pages = (len(display_df) + items_per_page - 1) // items_per_page
 
-if total_pages > 0:
-    page = st.slider("Page", 1, max(1, total_pages), 1)
-    start_idx = (page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, len(display_df))
+    if total_pages > 0:
+        page = st.slider("Page", 1, total_pages, 1) if total_pages > 1 else 1
+        start_idx = (page - 1) * items_per_page
+        end_idx = min(start_idx + items_per_page, len(display_df))
     
-    page_df = display_df.iloc[start_idx:end_idx]
+        page_df = display_df.iloc[start_idx:end_idx]
+        detail_cols = [c for c in DETAIL_COLS if c in page_df.columns]
     
-    for i, (idx, row) in enumerate(page_df.iterrows()):
-        with st.expander(f"Error #{idx}: {row['Task ID']} - {row['LQE Date'].strftime('%Y-%m-%d')} - {row['Content Type']}"):
-            cols = st.columns([1, 2])
-            with cols[0]:
-                st.markdown("#### Error Details")
-                st.markdown(f"**Owner:** {row['Owner']}")
-                st.markdown(f"**Project:** {row['Project']}")
-                st.markdown(f"**Product:** {row['Product']}")
-                st.markdown(f"**Service Type:** {row['Service Type']}")
-                st.markdown(f"**Issue Type:** {row['Issue Type']}")
-                st.markdown(f"**Factor:** {row['Internal/External factor validated by LL']}")
-                st.markdown(f"**Category:** {row['Category']}")
-                st.markdown(f"**Sub-category:** {row['Sub - cateogory']}")
-                st.markdown(f"**Status:** {row['Final status']}")
-            
-            with cols[1]:
-                st.markdown("#### Translation & Correction")
-                st.markdown("**Source Text:**")
-                if 'Source Text' in row and not pd.isna(row['Source Text']):
-                    st.markdown(f"<div class='highlight-box'>{row['Source Text']}</div>", unsafe_allow_html=True)
-                else:
-                    st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
+        event = st.dataframe(
+            page_df[detail_cols],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'LQE Date': st.column_config.DateColumn('LQE Date', format='YYYY-MM-DD'),
+                'Internal/External factor validated by LL': st.column_config.TextColumn('Factor'),
+                'Sub - cateogory': st.column_config.TextColumn('Sub-category'),
+                'Corrected Text Show Edits': st.column_config.TextColumn(
+                    'Corrected Text Show Edits', help="Select a row to see the highlighted edits"),
+            },
+            on_select="rerun",
+            selection_mode="single-row",
+        )
     
-                st.markdown("**Translated Text:**")
-                if 'Translated Text' in row and not pd.isna(row['Translated Text']):
-                    st.markdown(f"<div class='highlight-box'>{row['Translated Text']}</div>", unsafe_allow_html=True)
-                else:
-                    st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
+        # Rich view with the HTML edit highlighting for the selected error only
+        if event.selection.rows:
+            # A plain dict record avoids building a per-row Series
+            pos = event.selection.rows[0]
+            idx = page_df.index[pos]
+            row = page_df.iloc[pos:pos + 1].to_dict('records')[0]
+            with st.expander(f"Error #{idx}: {row['Task ID']} - {row['LQE Date'].strftime('%Y-%m-%d')} - {row['Content Type']}", expanded=True):
+                cols = st.columns([1, 2])
+                with cols[0]:
+                    st.markdown("#### Error Details")
+                    st.markdown(f"**Owner:** {row['Owner']}")
+                    st.markdown(f"**Project:** {row['Project']}")
+                    st.markdown(f"**Product:** {row['Product']}")
+                    st.markdown(f"**Service Type:** {row['Service Type']}")
+                    st.markdown(f"**Issue Type:** {row['Issue Type']}")
+                    st.markdown(f"**Factor:** {row['Internal/External factor validated by LL']}")
+                    st.markdown(f"**Category:** {row['Category']}")
+                    st.markdown(f"**Sub-category:** {row['Sub - cateogory']}")
+                    st.markdown(f"**Status:** {row['Final status']}")
+            
+                with cols[1]:
+                    st.markdown("#### Translation & Correction")
+                    st.markdown("**Source Text:**")
+                    if 'Source Text' in row and not pd.isna(row['Source Text']):
+                        st.markdown(f"<div class='highlight-box'>{row['Source Text']}</div>", unsafe_allow_html=True)
+                    else:
+                        st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
     
-                st.markdown("**Corrected Text Show Edits:**")
-                try:
-                    # Try multiple approaches to handle the column correctly
-                    if 'Corrected Text Show Edits' in row and row['Corrected Text Show Edits'] is not None:
-                        if not pd.isna(row['Corrected Text Show Edits']):
-                            st.markdown(f"<div class='highlight-box'>{row['Corrected Text Show Edits']}</div>", unsafe_allow_html=True)
-                        else:
-                            st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
+                    st.markdown("**Translated Text:**")
+                    if 'Translated Text' in row and not pd.isna(row['Translated Text']):
+                        st.markdown(f"<div class='highlight-box'>{row['Translated Text']}</div>", unsafe_allow_html=True)
                     else:
-                        # Look for similar column names
-                        possible_columns = [col for col in row.index if 'correct' in col.lower() and 'edit' in col.lower()]
-                        if possible_columns:
-                            st.markdown(f"<div class='highlight-box'>{row[possible_columns[0]]}</div>", unsafe_allow_html=True)
+                        st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
+    
+                    st.markdown("**Corrected Text Show Edits:**")
+                    try:
+                        # Try multiple approaches to handle the column correctly
+                        if 'Corrected Text Show Edits' in row and row['Corrected Text Show Edits'] is not None:
+                            if not pd.isna(row['Corrected Text Show Edits']):
+                                st.markdown(f"<div class='highlight-box'>{row['Corrected Text Show Edits']}</div>", unsafe_allow_html=True)
+                            else:
+                                st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
                         else:
-                            st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
-                except Exception as e:
-                    st.markdown(f"<div class='highlight-box'>Error displaying Hindi text: {str(e)}</div>", unsafe_allow_html=True)
+                            # Look for similar column names
+                            possible_columns = [col for col in row if 'correct' in col.lower() and 'edit' in col.lower()]
+                            if possible_columns:
+                                st.markdown(f"<div class='highlight-box'>{row[possible_columns[0]]}</div>", unsafe_allow_html=True)
+                            else:
+                                st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
+                    except Exception as e:
+                        st.markdown(f"<div class='highlight-box'>Error displaying Hindi text: {str(e)}</div>", unsafe_allow_html=True)
     
-                st.markdown("**Error Type & Comment:**")
-                if 'Error Type & comment' in row and not pd.isna(row['Error Type & comment']):
-                    st.markdown(f"<div class='highlight-box'>{row['Error Type & comment']}</div>", unsafe_allow_html=True)
-                else:
-                    st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
+                    st.markdown("**Error Type & Comment:**")
+                    if 'Error Type & comment' in row and not pd.isna(row['Error Type & comment']):
+                        st.markdown(f"<div class='highlight-box'>{row['Error Type & comment']}</div>", unsafe_allow_html=True)
+                    else:
+                        st.markdown("<div class='highlight-box'>Not available</div>", unsafe_allow_html=True)
     
-                if 'Remark' in row and pd.notna(row['Remark']):
-                    st.markdown("**Remarks:**")
-                    st.markdown(f"<div class='highlight-box'>{row['Remark']}</div>", unsafe_allow_html=True)
+                    if 'Remark' in row and pd.notna(row['Remark']):
+                        st.markdown("**Remarks:**")
+                        st.markdown(f"<div class='highlight-box'>{row['Remark']}</div>", unsafe_allow_html=True)
 
-else:
-    st.info("No errors found matching the current filters.")
+    else:
+        st.info("No errors found matching the current filters.")
+
+error_details_panel(filtered_df)
 
 # Footer
 st.markdown("---")